@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
+import time
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
@@ -13,6 +15,9 @@ JWT_SECRET = os.environ.get('JWT_SECRET', 'default_secret_key')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Decoded tokens: {token: (current_user, exp)}
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -42,6 +47,10 @@ def decode_token(token: str) -> dict:
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
     payload = decode_token(token)
     user_id = payload.get("sub")
     if user_id is None:
@@ -49,4 +58,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
-    return {"user_id": user_id, "email": payload.get("email")}
+    current_user = {"user_id": user_id, "email": payload.get("email")}
+    _token_cache[token] = (current_user, payload.get("exp", 0))
+    return current_user
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
-import uuid
+import msgspec
+import secrets
 
 # User Models
 class UserCreate(BaseModel):
@@ -16,7 +17,7 @@ class UserLogin(BaseModel):
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: secrets.token_hex(16))
     email: EmailStr
     name: str
     hashed_password: str
@@ -50,11 +51,11 @@ class BoardUpdate(BaseModel):
 class Board(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: secrets.token_hex(16))
     title: str
     description: Optional[str] = None
     owner_id: str
-    share_token: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    share_token: str = Field(default_factory=lambda: secrets.token_hex(16))
     objects: List[BoardObject] = []
     version: int = 0
     collaborators: List[str] = []  # List of user IDs
@@ -73,11 +74,23 @@ class BoardResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class BoardListResponse(BaseModel):
+    id: str
+    title: str
+    description: Optional[str]
+    owner_id: str
+    share_token: str
+    object_count: int
+    version: int
+    collaborators: List[str]
+    created_at: datetime
+    updated_at: datetime
+
 # Board Version History
 class BoardVersion(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: secrets.token_hex(16))
     board_id: str
     version: int
     objects: List[BoardObject]
@@ -89,6 +102,26 @@ class WSMessage(BaseModel):
     type: str
     data: Dict[str, Any]
 
+# High-frequency Socket.IO payloads are validated with msgspec Structs, which
+# are much cheaper than Pydantic models at cursor/draw message rates
+class WSBoardObject(msgspec.Struct):
+    id: str
+    type: str
+    data: Dict[str, Any]
+
+class WSCursor(msgspec.Struct):
+    x: float
+    y: float
+
+class WSCursorMove(msgspec.Struct):
+    board_id: str
+    cursor: WSCursor
+
+class WSBoardUpdate(msgspec.Struct):
+    board_id: str
+    objects: List[WSBoardObject]
+    version: int
+
 # AI Suggestion Models
 class AISuggestionRequest(BaseModel):
     board_id: str
@@ -96,7 +129,7 @@ class AISuggestionRequest(BaseModel):
     context: Optional[str] = None
 
 class AISuggestion(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: secrets.token_hex(16))
     type: str  # shape_clean, annotation, diagram_improvement
     title: str
     description: str
@@ -1,18 +1,32 @@
 from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
 import os
 import logging
+import asyncio
+import time
 from pathlib import Path
-from typing import List
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional
 import socketio
+import orjson
+import msgspec
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from google import genai
 from datetime import datetime, timezone
 
 from models import (
     UserCreate, UserLogin, TokenResponse, User, UserResponse,
-    BoardCreate, BoardUpdate, Board, BoardResponse,
-    AISuggestionRequest, AISuggestion
+    BoardObject, BoardCreate, BoardUpdate, Board, BoardResponse, BoardListResponse,
+    AISuggestionRequest, AISuggestion,
+    WSCursorMove, WSBoardUpdate
 )
 from auth import (
     get_password_hash, verify_password, create_access_token, get_current_user
@@ -21,21 +35,127 @@ from auth import (
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection: one client (and connection pool) for the whole process.
+# Motor's executor size is read from MOTOR_MAX_WORKERS in the environment.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 50)),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 10)),
+    serverSelectionTimeoutMS=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 2000)),
+    # Timestamps are stored as BSON dates; read them back as UTC-aware datetimes
+    tz_aware=True
+)
 db = client[os.environ['DB_NAME']]
 
-# Socket.IO setup
+# Redis cache (optional, disabled when REDIS_URL is not set)
+redis_url = os.environ.get('REDIS_URL')
+redis_client = aioredis.from_url(redis_url) if redis_url else None
+
+BOARD_CACHE_TTL = 60
+BOARDS_LIST_CACHE_TTL = 60
+USER_CACHE_TTL = 300
+
+async def cache_get(key: str):
+    if redis_client is None:
+        return None
+    try:
+        cached = await redis_client.get(key)
+    except RedisError as e:
+        logging.warning(f"Redis get failed for {key}: {e}")
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+async def cache_set(key: str, value, ttl: int):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, orjson.dumps(value))
+    except RedisError as e:
+        logging.warning(f"Redis set failed for {key}: {e}")
+
+async def cache_delete(*keys: str):
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        logging.warning(f"Redis delete failed for {keys}: {e}")
+
+def parse_timestamps(doc: dict) -> dict:
+    """Turn ISO-string created_at/updated_at into datetimes.
+
+    Strings come from JSON cache entries and from documents written before
+    timestamps were stored as BSON dates.
+    """
+    for field in ('created_at', 'updated_at'):
+        value = doc.get(field)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+            doc[field] = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return doc
+
+async def invalidate_board_cache(board_id: str, member_ids: List[str]):
+    """Drop the cached board and the board lists of everyone who can see it."""
+    await cache_delete(
+        f"board:{board_id}",
+        *(f"boards:user:{member_id}" for member_id in member_ids)
+    )
+
+# Gemini client, shared across requests so its HTTP connection pool is reused
+gemini_api_key = os.environ.get('GEMINI_API_KEY')
+gemini_client = genai.Client(api_key=gemini_api_key) if gemini_api_key else None
+
+# Socket.IO setup. With Redis available, emits and rooms are shared through
+# Redis pub/sub so the app can run under several (sticky-session) workers.
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    client_manager=socketio.AsyncRedisManager(redis_url) if redis_url else None,
     cors_allowed_origins='*',
     logger=False,
     engineio_logger=False
 )
+# Pre-bound for the cursor hot path
+sio_emit = sio.emit
+
+async def create_indexes():
+    # owner_id and collaborators are indexed separately so the $or in
+    # get_boards can be answered by an index union instead of a collection scan
+    await db.boards.create_index("owner_id")
+    await db.boards.create_index("collaborators")
+    await db.boards.create_index("id", unique=True)
+    await db.boards.create_index("share_token", unique=True)
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.board_versions.create_index("board_id")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pool (and surface config errors) before traffic arrives
+    await client.admin.command("ping")
+    await create_indexes()
+    heartbeat = spawn(presence_heartbeat()) if redis_client is not None else None
+    yield
+    if heartbeat is not None:
+        heartbeat.cancel()
+        # Drop this worker's sockets from shared presence instead of waiting for the TTL
+        for sid, board_id in list(sid_to_board.items()):
+            await presence_remove(board_id, sid)
+    # Persist edits still waiting on the debounce timer, retrying failed writes
+    for _ in range(SHUTDOWN_FLUSH_ATTEMPTS):
+        for board_id in list(pending_writes):
+            await persist_board(board_id)
+        if not pending_writes:
+            break
+        await asyncio.sleep(BOARD_WRITE_DEBOUNCE)
+    if pending_writes:
+        logging.error(f"Unsaved edits lost on shutdown for boards: {sorted(pending_writes)}")
+    client.close()
+    if redis_client is not None:
+        await redis_client.aclose()
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Root endpoint
@@ -51,11 +171,89 @@ async def root():
         }
     }
 
-# Active board connections: {board_id: {sid: user_data}}
-active_connections = {}
+@dataclass(slots=True)
+class UserPresence:
+    user_id: str
+    name: str
+    cursor_x: float = 0
+    cursor_y: float = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'user_id': self.user_id,
+            'name': self.name,
+            'cursor': {'x': self.cursor_x, 'y': self.cursor_y}
+        }
+
+# Active board connections: {board_id: {sid: UserPresence}}
+active_connections: dict[str, dict[str, UserPresence]] = {}
+# Reverse index so a disconnect only touches the socket's own room: {sid: board_id}
+sid_to_board: dict[str, str] = {}
+
+# Each socket gets at most one cursor_moved broadcast per interval; moves arriving
+# sooner are coalesced and the latest one is sent once the socket's interval ends
+CURSOR_EMIT_INTERVAL = 1 / 30
+# Last cursor_moved broadcast: {(board_id, sid): time.monotonic()}
+last_cursor_emit: dict[tuple[str, str], float] = {}
+# Throttled cursors waiting for a flush: {(board_id, sid): cursor}
+pending_cursors: dict[tuple[str, str], dict] = {}
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+background_tasks: set[asyncio.Task] = set()
+
+def spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+# board_update events are broadcast immediately but persisted at most once per
+# interval per board, last write wins: {board_id: {objects, version, updated_at}}
+#
+# This state is per process. With several workers, only the worker that received
+# an edit overlays it on board reads; the others serve the last persisted state,
+# at most about BOARD_WRITE_DEBOUNCE plus one write behind. Writes are guarded
+# on version, so when workers flush the same board an older version never
+# replaces a newer one.
+BOARD_WRITE_DEBOUNCE = 1.0
+SHUTDOWN_FLUSH_ATTEMPTS = 3
+pending_writes: dict[str, dict] = {}
+# Updates currently being written to MongoDB: {board_id: update}
+inflight_writes: dict[str, dict] = {}
+# Completed writes per board, so a read that raced a write does not cache the
+# document it replaced: {board_id: count}
+board_write_seq: dict[str, int] = {}
+
+def unsaved_board_state(board_id) -> Optional[dict]:
+    """Latest broadcast board state that is not yet in MongoDB, if any."""
+    return pending_writes.get(board_id) or inflight_writes.get(board_id)
+
+# board_update timestamps have one-second resolution, so the datetime and its
+# ISO string are built once per second instead of once per message
+_ts_cache = {'sec': 0, 'dt': None, 'iso': ''}
+
+def cached_utc_now() -> tuple[datetime, str]:
+    sec = int(time.time())
+    if sec != _ts_cache['sec']:
+        now = datetime.fromtimestamp(sec, timezone.utc)
+        _ts_cache['sec'] = sec
+        _ts_cache['dt'] = now
+        _ts_cache['iso'] = now.isoformat()
+    return _ts_cache['dt'], _ts_cache['iso']
 
 # ============= Authentication Endpoints =============
 
+# Request bodies (UserCreate, UserLogin, ...) get full Pydantic validation. User
+# documents are only ever written from a validated User model, so the
+# UserResponse built from them uses model_construct() and skips validation.
+def user_response(user_dict: dict) -> UserResponse:
+    return UserResponse.model_construct(
+        id=user_dict['id'],
+        email=user_dict['email'],
+        name=user_dict['name'],
+        created_at=parse_timestamps(user_dict)['created_at']
+    )
+
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user_data: UserCreate):
     # Check if user exists
@@ -73,15 +271,12 @@ async def register(user_data: UserCreate):
         hashed_password=get_password_hash(user_data.password)
     )
     
-    user_dict = user.model_dump()
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
-    
-    await db.users.insert_one(user_dict)
+    await db.users.insert_one(user.model_dump())
     
     # Create token
     access_token = create_access_token(data={"sub": user.id, "email": user.email})
     
-    user_response = UserResponse(
+    user_response = UserResponse.model_construct(
         id=user.id,
         email=user.email,
         name=user.name,
@@ -109,14 +304,7 @@ async def login(credentials: UserLogin):
         data={"sub": user_dict['id'], "email": user_dict['email']}
     )
     
-    user_response = UserResponse(
-        id=user_dict['id'],
-        email=user_dict['email'],
-        name=user_dict['name'],
-        created_at=datetime.fromisoformat(user_dict['created_at'])
-    )
-    
-    return TokenResponse(access_token=access_token, user=user_response)
+    return TokenResponse(access_token=access_token, user=user_response(user_dict))
 
 @api_router.post("/auth/google", response_model=TokenResponse)
 async def google_login(request: dict):
@@ -197,7 +385,6 @@ async def google_login(request: dict):
                 hashed_password=get_password_hash(google_id)
             )
             user_dict = user.model_dump()
-            user_dict['created_at'] = user_dict['created_at'].isoformat()
             await db.users.insert_one(user_dict)
         
         # Create JWT token
@@ -205,14 +392,7 @@ async def google_login(request: dict):
             data={"sub": user_dict['id'], "email": user_dict['email']}
         )
         
-        user_response = UserResponse(
-            id=user_dict['id'],
-            email=user_dict['email'],
-            name=user_dict['name'],
-            created_at=datetime.fromisoformat(user_dict['created_at'])
-        )
-        
-        return TokenResponse(access_token=access_token, user=user_response)
+        return TokenResponse(access_token=access_token, user=user_response(user_dict))
         
     except ValueError as e:
         logging.error(f"Google token verification failed: {e}")
@@ -229,19 +409,37 @@ async def google_login(request: dict):
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    user_dict = await db.users.find_one({"id": current_user['user_id']}, {"_id": 0})
-    if not user_dict:
-        raise HTTPException(status_code=404, detail="User not found")
+    cache_key = f"user:{current_user['user_id']}"
+    user_dict = await cache_get(cache_key)
+    if user_dict is None:
+        user_dict = await db.users.find_one(
+            {"id": current_user['user_id']},
+            {"_id": 0, "hashed_password": 0}
+        )
+        if not user_dict:
+            raise HTTPException(status_code=404, detail="User not found")
+        await cache_set(cache_key, user_dict, USER_CACHE_TTL)
     
-    return UserResponse(
-        id=user_dict['id'],
-        email=user_dict['email'],
-        name=user_dict['name'],
-        created_at=datetime.fromisoformat(user_dict['created_at'])
-    )
+    return user_response(user_dict)
 
 # ============= Board Endpoints =============
 
+# Board documents come from two writers: the validated Board model (HTTP API)
+# and the board_update socket event, whose objects are shape-checked by the
+# WSBoardUpdate msgspec Struct rather than Pydantic. Both guarantee the
+# {id, type, data} layout, so responses skip validation via model_construct();
+# nested objects are constructed too so the serializer sees BoardObject instances.
+# Edits that have been broadcast but not yet persisted are applied on top, so
+# every endpoint returning a board agrees with what the room has already seen.
+def board_response(board: dict) -> BoardResponse:
+    unsaved = unsaved_board_state(board['id'])
+    if unsaved:
+        board = {**board, **unsaved}
+    return BoardResponse.model_construct(**{
+        **parse_timestamps(board),
+        'objects': [BoardObject.model_construct(**obj) for obj in board['objects']]
+    })
+
 @api_router.post("/boards", response_model=BoardResponse)
 async def create_board(board_data: BoardCreate, current_user: dict = Depends(get_current_user)):
     board = Board(
@@ -250,83 +448,117 @@ async def create_board(board_data: BoardCreate, current_user: dict = Depends(get
         owner_id=current_user['user_id']
     )
     
-    board_dict = board.model_dump()
-    board_dict['created_at'] = board_dict['created_at'].isoformat()
-    board_dict['updated_at'] = board_dict['updated_at'].isoformat()
-    
-    await db.boards.insert_one(board_dict)
-    
-    return BoardResponse(**board.model_dump())
-
-@api_router.get("/boards", response_model=List[BoardResponse])
+    await db.boards.insert_one(board.model_dump())
+    await cache_delete(f"boards:user:{current_user['user_id']}")
+    
+    return board_response(board.model_dump())
+
+# The dashboard only needs board metadata, so the objects array stays in MongoDB
+BOARD_LIST_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "title": 1,
+    "description": 1,
+    "owner_id": 1,
+    "share_token": 1,
+    "version": 1,
+    "collaborators": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "object_count": {"$size": {"$ifNull": ["$objects", []]}}
+}
+
+@api_router.get("/boards", response_model=List[BoardListResponse])
 async def get_boards(current_user: dict = Depends(get_current_user)):
-    boards = await db.boards.find(
-        {"$or": [
-            {"owner_id": current_user['user_id']},
-            {"collaborators": current_user['user_id']}
-        ]},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    for board in boards:
-        board['created_at'] = datetime.fromisoformat(board['created_at'])
-        board['updated_at'] = datetime.fromisoformat(board['updated_at'])
-    
-    return [BoardResponse(**board) for board in boards]
+    cache_key = f"boards:user:{current_user['user_id']}"
+    boards = await cache_get(cache_key)
+    if boards is None:
+        boards = await db.boards.find(
+            {"$or": [
+                {"owner_id": current_user['user_id']},
+                {"collaborators": current_user['user_id']}
+            ]},
+            BOARD_LIST_PROJECTION
+        ).batch_size(100).to_list(1000)
+        await cache_set(cache_key, boards, BOARDS_LIST_CACHE_TTL)
+    
+    return [BoardListResponse.model_construct(**parse_timestamps(board)) for board in boards]
 
 @api_router.get("/boards/{board_id}", response_model=BoardResponse)
 async def get_board(board_id: str, current_user: dict = Depends(get_current_user)):
-    board = await db.boards.find_one({"id": board_id}, {"_id": 0})
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
+    cache_key = f"board:{board_id}"
+    board = await cache_get(cache_key)
+    if board is None:
+        write_seq = board_write_seq.get(board_id, 0)
+        board = await db.boards.find_one({"id": board_id}, {"_id": 0})
+        if not board:
+            raise HTTPException(status_code=404, detail="Board not found")
+        # Don't cache a document that a queued, in-flight or just-finished
+        # write replaces; the next read after the write will cache it
+        if unsaved_board_state(board_id) is None and board_write_seq.get(board_id, 0) == write_seq:
+            await cache_set(cache_key, board, BOARD_CACHE_TTL)
     
     # Check access
     if board['owner_id'] != current_user['user_id'] and current_user['user_id'] not in board['collaborators']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    board['created_at'] = datetime.fromisoformat(board['created_at'])
-    board['updated_at'] = datetime.fromisoformat(board['updated_at'])
-    
-    return BoardResponse(**board)
+    return board_response(board)
 
 @api_router.get("/boards/share/{share_token}", response_model=BoardResponse)
 async def get_board_by_share_token(share_token: str, current_user: dict = Depends(get_current_user)):
-    board = await db.boards.find_one({"share_token": share_token}, {"_id": 0})
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    
-    # Add user as collaborator if not already
-    if current_user['user_id'] not in board['collaborators'] and board['owner_id'] != current_user['user_id']:
-        await db.boards.update_one(
-            {"id": board['id']},
-            {"$addToSet": {"collaborators": current_user['user_id']}}
-        )
-        board['collaborators'].append(current_user['user_id'])
-    
-    board['created_at'] = datetime.fromisoformat(board['created_at'])
-    board['updated_at'] = datetime.fromisoformat(board['updated_at'])
-    
-    return BoardResponse(**board)
+    user_id = current_user['user_id']
+    
+    # Add user as collaborator atomically; $addToSet is a no-op for existing
+    # collaborators, and the pre-update document tells us whether it changed
+    board = await db.boards.find_one_and_update(
+        {"share_token": share_token, "owner_id": {"$ne": user_id}},
+        {"$addToSet": {"collaborators": user_id}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if board:
+        if user_id not in board['collaborators']:
+            board['collaborators'].append(user_id)
+            # Every member's cached list shows the collaborator set, not just the new one's
+            await invalidate_board_cache(board['id'], [board['owner_id'], *board['collaborators']])
+    else:
+        # Either the owner opened their own link or the token is unknown
+        board = await db.boards.find_one({"share_token": share_token}, {"_id": 0})
+        if not board:
+            raise HTTPException(status_code=404, detail="Board not found")
+    
+    return board_response(board)
 
 @api_router.put("/boards/{board_id}", response_model=BoardResponse)
 async def update_board(board_id: str, board_data: BoardUpdate, current_user: dict = Depends(get_current_user)):
-    board = await db.boards.find_one({"id": board_id}, {"_id": 0})
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
-    
-    if board['owner_id'] != current_user['user_id']:
-        raise HTTPException(status_code=403, detail="Only owner can update board")
+    # Ownership is part of the filter, so the common path is a single round-trip
+    owner_filter = {"id": board_id, "owner_id": current_user['user_id']}
     
     update_data = {k: v for k, v in board_data.model_dump().items() if v is not None}
     if update_data:
-        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        await db.boards.update_one({"id": board_id}, {"$set": update_data})
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        updated_board = await db.boards.find_one_and_update(
+            owner_filter,
+            {"$set": update_data},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    else:
+        updated_board = await db.boards.find_one(owner_filter, {"_id": 0})
+    
+    if not updated_board:
+        # Only pay for the extra lookup when we need to tell 404 from 403
+        board = await db.boards.find_one({"id": board_id}, {"_id": 0, "owner_id": 1})
+        if not board:
+            raise HTTPException(status_code=404, detail="Board not found")
+        raise HTTPException(status_code=403, detail="Only owner can update board")
     
-    updated_board = await db.boards.find_one({"id": board_id}, {"_id": 0})
-    updated_board['created_at'] = datetime.fromisoformat(updated_board['created_at'])
-    updated_board['updated_at'] = datetime.fromisoformat(updated_board['updated_at'])
+    if update_data:
+        await invalidate_board_cache(
+            board_id, [updated_board['owner_id'], *updated_board['collaborators']]
+        )
     
-    return BoardResponse(**updated_board)
+    return board_response(updated_board)
 
 @api_router.delete("/boards/{board_id}")
 async def delete_board(board_id: str, current_user: dict = Depends(get_current_user)):
@@ -339,29 +571,15 @@ async def delete_board(board_id: str, current_user: dict = Depends(get_current_u
     
     await db.boards.delete_one({"id": board_id})
     await db.board_versions.delete_many({"board_id": board_id})
+    await invalidate_board_cache(board_id, [board['owner_id'], *board['collaborators']])
     
     return {"message": "Board deleted successfully"}
 
 # ============= AI Suggestions Endpoint =============
 
-@api_router.post("/ai/suggestions", response_model=List[AISuggestion])
-async def get_ai_suggestions(request: AISuggestionRequest, current_user: dict = Depends(get_current_user)):
-    import google.genai as genai
-    import json
+AI_REQUEST_TIMEOUT = 15  # seconds
 
-    # Configure Gemini API (new client)
-    client = genai.Client(api_key=os.environ.get('GEMINI_API_KEY'))
-    
-    # Prepare context for AI
-    objects_summary = f"Board contains {len(request.objects)} objects:\n"
-    for obj in request.objects[:10]:  # Limit to first 10 for context
-        objects_summary += f"- {obj.type}: {obj.data}\n"
-
-    user_prompt = ""
-    if request.context:
-        user_prompt = f"\nUser prompt:\n{request.context}\n"
-    
-        prompt = f"""You are an AI assistant for a collaborative whiteboard. Analyze the following drawing objects and user request.
+AI_PROMPT_TEMPLATE = """You are an AI assistant for a collaborative whiteboard. Analyze the following drawing objects and user request.
 
 {objects_summary}
 {user_prompt}
@@ -398,21 +616,44 @@ CRITICAL:
 - Support positions: "below the triangle", "to the right" → position: below, reference: triangle
 - Return ONLY valid JSON (no markdown fences)
 """
+
+@api_router.post("/ai/suggestions", response_model=List[AISuggestion])
+async def get_ai_suggestions(request: AISuggestionRequest, current_user: dict = Depends(get_current_user)):
+    # Prepare context for AI
+    objects_summary = f"Board contains {len(request.objects)} objects:\n"
+    for obj in request.objects[:10]:  # Limit to first 10 for context
+        objects_summary += f"- {obj.type}: {obj.data}\n"
+
+    user_prompt = ""
+    if request.context:
+        user_prompt = f"\nUser prompt:\n{request.context}\n"
+    
+    prompt = AI_PROMPT_TEMPLATE.format(
+        objects_summary=objects_summary,
+        user_prompt=user_prompt
+    )
     
     try:
-        # Call Gemini API
-        result = client.models.generate_content(
-            model='gemini-1.5-flash',
-            contents=prompt,
-            generation_config={
-                'temperature': 0.6,
-                'response_mime_type': 'application/json'
-            }
+        if gemini_client is None:
+            raise RuntimeError("GEMINI_API_KEY is not configured")
+        
+        # Call Gemini API without blocking the event loop, bounded so a stuck
+        # upstream call cannot pin the request indefinitely
+        result = await asyncio.wait_for(
+            gemini_client.aio.models.generate_content(
+                model='gemini-1.5-flash',
+                contents=prompt,
+                config={
+                    'temperature': 0.6,
+                    'response_mime_type': 'application/json'
+                }
+            ),
+            timeout=AI_REQUEST_TIMEOUT
         )
 
         response_text = result.text.strip()
 
-        suggestions_data = json.loads(response_text)
+        suggestions_data = orjson.loads(response_text)
         
         suggestions = []
         for sugg in suggestions_data:
@@ -466,23 +707,109 @@ CRITICAL:
 async def connect(sid, environ):
     logging.info(f"Client {sid} connected")
 
+# Board presence shared across workers: HSET board:{board_id}:users {sid} {json}.
+# Live state (cursors, throttling) stays in the local active_connections. Each
+# worker re-publishes its own sockets, current cursor included, every
+# PRESENCE_HEARTBEAT seconds. Entries not refreshed within PRESENCE_TTL belong
+# to a worker that died and are pruned on read. users_list therefore carries live
+# cursors for local sockets and cursors up to PRESENCE_HEARTBEAT old for others.
+PRESENCE_HEARTBEAT = 15
+PRESENCE_TTL = 45
+
+async def publish_presence(board_id, presences: dict[str, UserPresence]):
+    if redis_client is None or not presences:
+        return
+    key = f"board:{board_id}:users"
+    seen = time.time()
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                sid: orjson.dumps({**presence.to_dict(), 'seen': seen})
+                for sid, presence in presences.items()
+            })
+            pipe.expire(key, PRESENCE_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        logging.warning(f"Redis presence update failed for {key}: {e}")
+
+async def presence_add(board_id, sid, presence: UserPresence):
+    await publish_presence(board_id, {sid: presence})
+
+async def presence_heartbeat():
+    while True:
+        await asyncio.sleep(PRESENCE_HEARTBEAT)
+        for board_id, room in list(active_connections.items()):
+            # An unexpected error must not end the heartbeat, or this worker's
+            # entries expire from every other worker's user list
+            try:
+                await publish_presence(board_id, dict(room))
+            except Exception:
+                logging.exception(f"Presence heartbeat failed for board {board_id}")
+
+async def presence_remove(board_id, sid):
+    if redis_client is None:
+        return
+    key = f"board:{board_id}:users"
+    try:
+        await redis_client.hdel(key, sid)
+    except RedisError as e:
+        logging.warning(f"Redis presence update failed for {key}: {e}")
+
+async def presence_list(board_id) -> List[dict]:
+    room = active_connections.get(board_id, {})
+    if redis_client is not None:
+        key = f"board:{board_id}:users"
+        try:
+            entries = await redis_client.hgetall(key)
+        except RedisError as e:
+            logging.warning(f"Redis presence lookup failed for {key}: {e}")
+        else:
+            cutoff = time.time() - PRESENCE_TTL
+            users, stale = [], []
+            for sid, entry in entries.items():
+                sid = sid.decode() if isinstance(sid, bytes) else sid
+                if sid in room:
+                    users.append(room[sid].to_dict())
+                    continue
+                user = orjson.loads(entry)
+                if user.pop('seen', 0) < cutoff:
+                    stale.append(sid)
+                    continue
+                users.append(user)
+            if stale:
+                try:
+                    await redis_client.hdel(key, *stale)
+                except RedisError as e:
+                    logging.warning(f"Redis presence cleanup failed for {key}: {e}")
+            return users
+    return [presence.to_dict() for presence in room.values()]
+
+async def leave_current_board(sid):
+    board_id = sid_to_board.pop(sid, None)
+    if board_id is None:
+        return
+    
+    room = active_connections.get(board_id)
+    presence = room.pop(sid, None) if room is not None else None
+    last_cursor_emit.pop((board_id, sid), None)
+    pending_cursors.pop((board_id, sid), None)
+    
+    # Clean up empty rooms safely
+    if room is not None and not room:
+        active_connections.pop(board_id, None)
+    
+    if presence is not None:
+        await presence_remove(board_id, sid)
+        # Notify others
+        await sio.emit('user_left', {
+            'user_id': presence.user_id,
+            'name': presence.name
+        }, room=board_id, skip_sid=sid)
+
 @sio.event
 async def disconnect(sid):
     logging.info(f"Client {sid} disconnected")
-    # Remove from all boards
-    for board_id in list(active_connections.keys()):
-        if sid in active_connections[board_id]:
-            user_data = active_connections[board_id][sid]
-            del active_connections[board_id][sid]
-            # Notify others
-            await sio.emit('user_left', {
-                'user_id': user_data['user_id'],
-                'name': user_data['name']
-            }, room=board_id, skip_sid=sid)
-
-            # Clean up empty rooms safely
-            if not active_connections.get(board_id):
-                active_connections.pop(board_id, None)
+    await leave_current_board(sid)
 
 @sio.event
 async def join_board(sid, data):
@@ -490,25 +817,25 @@ async def join_board(sid, data):
     user_id = data['user_id']
     name = data['name']
     
-    # Initialize board connections if not exists
-    if board_id not in active_connections:
-        active_connections[board_id] = {}
+    # A socket is tracked on one board at a time
+    previous_board_id = sid_to_board.get(sid)
+    if previous_board_id is not None and previous_board_id != board_id:
+        await leave_current_board(sid)
+        await sio.leave_room(sid, previous_board_id)
     
     # Add user to board
-    active_connections[board_id][sid] = {
-        'user_id': user_id,
-        'name': name,
-        'cursor': {'x': 0, 'y': 0}
-    }
+    presence = UserPresence(user_id=user_id, name=name)
+    active_connections.setdefault(board_id, {})[sid] = presence
+    sid_to_board[sid] = board_id
+    await presence_add(board_id, sid, presence)
     
     # Join Socket.IO room
     await sio.enter_room(sid, board_id)
     
     # Send current users to new user
     users = [
-        {'user_id': u['user_id'], 'name': u['name'], 'cursor': u['cursor']}
-        for u in active_connections[board_id].values()
-        if u['user_id'] != user_id
+        user for user in await presence_list(board_id)
+        if user['user_id'] != user_id
     ]
     await sio.emit('users_list', {'users': users}, to=sid)
     
@@ -520,47 +847,124 @@ async def join_board(sid, data):
 
 @sio.event
 async def cursor_move(sid, data):
-    board_id = data['board_id']
-    cursor = data['cursor']
-    
-    if board_id in active_connections and sid in active_connections[board_id]:
-        active_connections[board_id][sid]['cursor'] = cursor
-        
-        await sio.emit('cursor_moved', {
-            'user_id': active_connections[board_id][sid]['user_id'],
-            'cursor': cursor
-        }, room=board_id, skip_sid=sid)
+    try:
+        message = msgspec.convert(data, type=WSCursorMove)
+    except msgspec.ValidationError as e:
+        logging.warning(f"Invalid cursor_move from {sid}: {e}")
+        return
+    board_id = message.board_id
+    
+    # Single .get per level on the hot path instead of containment checks
+    room = active_connections.get(board_id)
+    presence = room.get(sid) if room is not None else None
+    if presence is None:
+        return
+    
+    x = presence.cursor_x = message.cursor.x
+    y = presence.cursor_y = message.cursor.y
+    cursor = {'x': x, 'y': y}
+    
+    now = time.monotonic()
+    key = (board_id, sid)
+    wait = last_cursor_emit.get(key, 0) + CURSOR_EMIT_INTERVAL - now
+    if wait > 0:
+        # The first throttled move schedules the flush for when this socket's
+        # interval ends; later ones only replace the pending position
+        if key not in pending_cursors:
+            spawn(flush_cursor(board_id, sid, wait))
+        pending_cursors[key] = cursor
+        return
+    
+    last_cursor_emit[key] = now
+    pending_cursors.pop(key, None)
+    
+    await sio_emit('cursor_moved', {
+        'user_id': presence.user_id,
+        'cursor': cursor
+    }, room=board_id, skip_sid=sid)
+
+async def flush_cursor(board_id, sid, delay):
+    await asyncio.sleep(delay)
+    key = (board_id, sid)
+    cursor = pending_cursors.pop(key, None)
+    room = active_connections.get(board_id)
+    presence = room.get(sid) if room is not None else None
+    if cursor is None or presence is None:
+        return
+    
+    last_cursor_emit[key] = time.monotonic()
+    await sio_emit('cursor_moved', {
+        'user_id': presence.user_id,
+        'cursor': cursor
+    }, room=board_id, skip_sid=sid)
 
 @sio.event
 async def board_update(sid, data):
-    board_id = data['board_id']
-    objects = data['objects']
-    version = data['version']
-    
-    # Ensure objects is a list and properly serializable
-    if not isinstance(objects, list):
-        objects = []
-    
-    # Update board in database
-    await db.boards.update_one(
-        {"id": board_id},
-        {
-            "$set": {
-                "objects": objects,
-                "version": version,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-        },
-        upsert=False
-    )
+    try:
+        message = msgspec.convert(data, type=WSBoardUpdate)
+    except msgspec.ValidationError as e:
+        logging.warning(f"Invalid board_update from {sid}: {e}")
+        return
+    board_id = message.board_id
+    version = message.version
+    
+    # Back to plain lists/dicts for BSON and the Socket.IO JSON encoder
+    objects = msgspec.to_builtins(message.objects)
+    
+    updated_at, updated_at_iso = cached_utc_now()
+    
+    # Queue the write; the first pending update schedules the flush
+    if board_id not in pending_writes:
+        spawn(flush_board(board_id))
+    pending_writes[board_id] = {
+        "objects": objects,
+        "version": version,
+        "updated_at": updated_at
+    }
     
     # Broadcast to ALL users in the room (including sender for confirmation)
     await sio.emit('board_updated', {
         'objects': objects,
         'version': version,
-        'updated_at': datetime.now(timezone.utc).isoformat()
+        'updated_at': updated_at_iso
     }, room=board_id)
 
+async def persist_board(board_id) -> bool:
+    """Write a board's pending state; on failure it is queued again."""
+    update = pending_writes.pop(board_id, None)
+    if update is None:
+        return True
+    # Stays visible to board reads until MongoDB has it
+    inflight_writes[board_id] = update
+    
+    # Update board in database, fetching its members for cache invalidation.
+    # No match means the board was deleted or already holds a newer version.
+    try:
+        board = await db.boards.find_one_and_update(
+            {"id": board_id, "version": {"$lte": update["version"]}},
+            {"$set": update},
+            projection={"_id": 0, "owner_id": 1, "collaborators": 1},
+            upsert=False
+        )
+    except PyMongoError as e:
+        logging.error(f"Failed to persist board {board_id}: {e}")
+        # An edit that arrived during the failed write is newer; keep that one
+        pending_writes.setdefault(board_id, update)
+        return False
+    else:
+        board_write_seq[board_id] = board_write_seq.get(board_id, 0) + 1
+    finally:
+        if inflight_writes.get(board_id) is update:
+            del inflight_writes[board_id]
+    if board:
+        await invalidate_board_cache(board_id, [board['owner_id'], *board['collaborators']])
+    return True
+
+async def flush_board(board_id):
+    await asyncio.sleep(BOARD_WRITE_DEBOUNCE)
+    if not await persist_board(board_id):
+        spawn(flush_board(board_id))
+
 # Add CORS middleware BEFORE including router
 cors_origins = os.environ.get("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
 app.add_middleware(
@@ -571,6 +975,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress board JSON (highly redundant) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -583,7 +990,3 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
@@ -196,7 +196,7 @@ export const DashboardPage = () => {
                   </p>
                 )}
                 <div className="flex items-center justify-between text-xs text-muted-foreground mb-4">
-                  <span>{board.objects?.length || 0} objects</span>
+                  <span>{board.object_count || 0} objects</span>
                   <span>Version {board.version}</span>
                 </div>
                 <Button
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "canvasflow_test")
+os.environ.pop("REDIS_URL", None)
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def emits(monkeypatch):
+    """Capture Socket.IO emits and reset per-process board state."""
+    emitted = []
+
+    async def fake_emit(event, data, **kwargs):
+        emitted.append((event, data, kwargs, time.monotonic()))
+
+    async def fake_room_op(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(server, "sio_emit", fake_emit)
+    monkeypatch.setattr(server.sio, "emit", fake_emit)
+    monkeypatch.setattr(server.sio, "enter_room", fake_room_op)
+    monkeypatch.setattr(server.sio, "leave_room", fake_room_op)
+    for state in (
+        server.active_connections, server.sid_to_board, server.last_cursor_emit,
+        server.pending_cursors, server.pending_writes, server.inflight_writes,
+        server.board_write_seq
+    ):
+        state.clear()
+    return emitted
@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import PyMongoError
+
+import server
+
+
+class FakeBoards:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.writes = []
+        # Tests may clear this to hold writes in flight
+        self.write_gate = asyncio.Event()
+        self.write_gate.set()
+        self.doc = {
+            "id": "board-1",
+            "title": "Board",
+            "description": None,
+            "owner_id": "user-a",
+            "share_token": "token",
+            "objects": [],
+            "version": 0,
+            "collaborators": [],
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "updated_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        }
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        if "$set" not in update:
+            # Share-link join: return the pre-update document
+            return dict(self.doc)
+        if self.failures:
+            self.failures -= 1
+            raise PyMongoError("connection reset")
+        await self.write_gate.wait()
+        if self.doc["version"] > query["version"]["$lte"]:
+            return None
+        self.writes.append(update["$set"])
+        self.doc.update(update["$set"])
+        return {"owner_id": "user-a", "collaborators": []}
+
+    async def find_one(self, query, projection=None):
+        return dict(self.doc)
+
+
+class FakeDB:
+    def __init__(self, boards):
+        self.boards = boards
+
+
+@pytest.fixture
+def boards(monkeypatch, emits):
+    fake = FakeBoards()
+    monkeypatch.setattr(server, "db", FakeDB(fake))
+    monkeypatch.setattr(server, "BOARD_WRITE_DEBOUNCE", 0.05)
+    return fake
+
+
+def update(version, objects=()):
+    return {"board_id": "board-1", "objects": list(objects), "version": version}
+
+
+def test_board_updates_are_debounced_into_one_write(boards, emits):
+    async def scenario():
+        await server.board_update("sid-a", update(1, [{"id": "o1", "type": "pen", "data": {}}]))
+        await server.board_update("sid-a", update(2, [{"id": "o2", "type": "text", "data": {}}]))
+        await asyncio.sleep(server.BOARD_WRITE_DEBOUNCE * 3)
+
+    asyncio.run(scenario())
+
+    assert [data["version"] for event, data, *_ in emits if event == "board_updated"] == [1, 2]
+    assert len(boards.writes) == 1
+    assert boards.writes[0]["version"] == 2
+    assert boards.writes[0]["objects"] == [{"id": "o2", "type": "text", "data": {}}]
+    assert server.pending_writes == {}
+
+
+def test_failed_write_is_requeued(boards):
+    boards.failures = 1
+
+    async def scenario():
+        await server.board_update("sid-a", update(3))
+        await asyncio.sleep(server.BOARD_WRITE_DEBOUNCE * 4)
+
+    asyncio.run(scenario())
+
+    assert [write["version"] for write in boards.writes] == [3]
+    assert server.pending_writes == {}
+
+
+def test_get_board_includes_unsaved_edits(boards):
+    async def scenario():
+        await server.board_update("sid-a", update(4, [{"id": "o1", "type": "pen", "data": {"points": [1, 2]}}]))
+        return await server.get_board("board-1", current_user={"user_id": "user-a"})
+
+    response = asyncio.run(scenario())
+
+    assert response.version == 4
+    assert response.objects[0].id == "o1"
+
+
+def test_older_version_does_not_overwrite_newer(boards):
+    # Another worker already persisted version 7
+    boards.doc["version"] = 7
+
+    async def scenario():
+        await server.board_update("sid-a", update(6, [{"id": "stale", "type": "pen", "data": {}}]))
+        await asyncio.sleep(server.BOARD_WRITE_DEBOUNCE * 3)
+
+    asyncio.run(scenario())
+
+    assert boards.writes == []
+    assert boards.doc["version"] == 7
+    assert server.pending_writes == {}
+
+
+def test_in_flight_write_stays_visible_and_uncached(boards, monkeypatch):
+    cached = []
+
+    async def fake_cache_set(key, value, ttl):
+        cached.append(key)
+
+    monkeypatch.setattr(server, "cache_set", fake_cache_set)
+
+    async def scenario():
+        boards.write_gate = asyncio.Event()
+        await server.board_update("sid-a", update(5, [{"id": "o1", "type": "pen", "data": {}}]))
+        await asyncio.sleep(server.BOARD_WRITE_DEBOUNCE * 2)
+        assert server.pending_writes == {}
+        assert "board-1" in server.inflight_writes
+        during = await server.get_board("board-1", current_user={"user_id": "user-a"})
+        boards.write_gate.set()
+        await asyncio.sleep(0.01)
+        return during
+
+    during = asyncio.run(scenario())
+
+    assert during.version == 5
+    assert cached == []
+    assert server.inflight_writes == {}
+    assert [write["version"] for write in boards.writes] == [5]
+
+
+def test_share_link_includes_unsaved_edits(boards):
+    async def scenario():
+        await server.board_update("sid-a", update(1, [{"id": "o1", "type": "pen", "data": {}}]))
+        return await server.get_board_by_share_token("token", current_user={"user_id": "user-b"})
+
+    response = asyncio.run(scenario())
+
+    assert response.version == 1
+    assert response.objects[0].id == "o1"
+    assert response.collaborators == ["user-b"]
+
+
+def test_shutdown_flushes_pending_writes(boards, monkeypatch):
+    boards.failures = 1
+
+    class FakeAdmin:
+        async def command(self, name):
+            return {"ok": 1}
+
+    class FakeClient:
+        admin = FakeAdmin()
+
+        def close(self):
+            pass
+
+    async def no_indexes():
+        pass
+
+    monkeypatch.setattr(server, "client", FakeClient())
+    monkeypatch.setattr(server, "create_indexes", no_indexes)
+
+    async def scenario():
+        async with server.lifespan(server.app):
+            server.pending_writes["board-1"] = {"objects": [], "version": 5, "updated_at": None}
+
+    asyncio.run(scenario())
+
+    assert [write["version"] for write in boards.writes] == [5]
+    assert server.pending_writes == {}
+
+
+def test_legacy_string_timestamps_are_parsed(boards):
+    boards.doc["created_at"] = "2025-06-01T12:00:00.094000+00:00"
+    boards.doc["updated_at"] = "2025-06-01T12:30:00Z"
+
+    response = asyncio.run(server.get_board("board-1", current_user={"user_id": "user-a"}))
+
+    assert response.created_at == datetime(2025, 6, 1, 12, 0, 0, 94000, tzinfo=timezone.utc)
+    assert response.updated_at == datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc)
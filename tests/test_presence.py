@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import fakeredis
+import orjson
+
+import server
+
+
+def test_users_list_merges_live_and_shared_presence(emits, monkeypatch):
+    async def scenario():
+        redis = fakeredis.aioredis.FakeRedis()
+        monkeypatch.setattr(server, "redis_client", redis)
+        key = "board:board-1:users"
+        await redis.hset(key, mapping={
+            "sid-remote": orjson.dumps({
+                "user_id": "user-r", "name": "Remote",
+                "cursor": {"x": 7, "y": 8}, "seen": time.time()
+            }),
+            "sid-ghost": orjson.dumps({
+                "user_id": "user-g", "name": "Ghost",
+                "cursor": {"x": 0, "y": 0}, "seen": time.time() - server.PRESENCE_TTL - 1
+            }),
+        })
+
+        await server.join_board("sid-a", {"board_id": "board-1", "user_id": "user-a", "name": "Alice"})
+        await server.cursor_move("sid-a", {"board_id": "board-1", "cursor": {"x": 3, "y": 4}})
+        emits.clear()
+        await server.join_board("sid-b", {"board_id": "board-1", "user_id": "user-b", "name": "Bob"})
+        return await redis.hkeys(key)
+
+    remaining = asyncio.run(scenario())
+
+    users_list = next(data for event, data, *_ in emits if event == "users_list")
+    users = {user["user_id"]: user["cursor"] for user in users_list["users"]}
+    assert users == {"user-a": {"x": 3, "y": 4}, "user-r": {"x": 7, "y": 8}}
+    assert b"sid-ghost" not in remaining
+
+
+def test_heartbeat_survives_unexpected_errors(emits, monkeypatch):
+    calls = []
+
+    async def flaky_publish(board_id, presences):
+        calls.append(board_id)
+        if len(calls) == 1:
+            raise ValueError("unserializable presence")
+
+    monkeypatch.setattr(server, "PRESENCE_HEARTBEAT", 0.01)
+
+    async def scenario():
+        await server.join_board("sid-a", {"board_id": "board-1", "user_id": "user-a", "name": "Alice"})
+        monkeypatch.setattr(server, "publish_presence", flaky_publish)
+        heartbeat = asyncio.create_task(server.presence_heartbeat())
+        await asyncio.sleep(0.05)
+        assert not heartbeat.done()
+        heartbeat.cancel()
+
+    asyncio.run(scenario())
+
+    assert len(calls) >= 2
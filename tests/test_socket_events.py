@@ -0,0 +1,52 @@
+import asyncio
+
+import server
+
+
+async def join(sid, user_id, name):
+    await server.join_board(sid, {"board_id": "board-1", "user_id": user_id, "name": name})
+
+
+def test_cursor_burst_is_coalesced(emits):
+    async def scenario():
+        await join("sid-a", "user-a", "Alice")
+        await join("sid-b", "user-b", "Bob")
+        emits.clear()
+
+        for i in range(5):
+            await server.cursor_move("sid-a", {"board_id": "board-1", "cursor": {"x": i, "y": i * 2}})
+        await asyncio.sleep(server.CURSOR_EMIT_INTERVAL * 3)
+
+    asyncio.run(scenario())
+
+    moved = [data for event, data, *_ in emits if event == "cursor_moved"]
+    assert len(moved) == 2
+    assert moved[0] == {"user_id": "user-a", "cursor": {"x": 0, "y": 0}}
+    assert moved[-1] == {"user_id": "user-a", "cursor": {"x": 4, "y": 8}}
+
+
+def test_cursor_cap_is_per_socket(emits):
+    async def scenario():
+        await join("sid-a", "user-a", "Alice")
+        await join("sid-b", "user-b", "Bob")
+        emits.clear()
+
+        await server.cursor_move("sid-a", {"board_id": "board-1", "cursor": {"x": 0, "y": 0}})
+        await server.cursor_move("sid-a", {"board_id": "board-1", "cursor": {"x": 1, "y": 1}})
+        # sid-b is throttled late in sid-a's window; its flush must wait for its own interval
+        await asyncio.sleep(server.CURSOR_EMIT_INTERVAL * 0.8)
+        await server.cursor_move("sid-b", {"board_id": "board-1", "cursor": {"x": 5, "y": 5}})
+        await server.cursor_move("sid-b", {"board_id": "board-1", "cursor": {"x": 6, "y": 6}})
+        await asyncio.sleep(server.CURSOR_EMIT_INTERVAL * 3)
+
+    asyncio.run(scenario())
+
+    assert server.pending_cursors == {}
+    by_user = {}
+    for event, data, _, at in emits:
+        if event == "cursor_moved":
+            by_user.setdefault(data["user_id"], []).append((data["cursor"], at))
+    assert [cursor for cursor, _ in by_user["user-a"]] == [{"x": 0, "y": 0}, {"x": 1, "y": 1}]
+    assert [cursor for cursor, _ in by_user["user-b"]] == [{"x": 5, "y": 5}, {"x": 6, "y": 6}]
+    for sent in by_user.values():
+        assert sent[1][1] - sent[0][1] >= server.CURSOR_EMIT_INTERVAL * 0.95